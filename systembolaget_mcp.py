@@ -4,38 +4,137 @@ A Model Context Protocol server for interacting with Systembolaget's APIs.
 Provides tools for searching products, stores, and retrieving detailed information.
 """
 
+import asyncio
 import json
 import logging
 import os
 import re
-from functools import wraps
-from typing import Optional, Literal, Callable, Any
+import time
+import weakref
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from functools import lru_cache, wraps
+from pathlib import Path
+from types import MappingProxyType
+from typing import Optional, Literal, Callable, Any, AsyncIterator, Mapping, TypeVar
 import httpx
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from async_lru import alru_cache
+from pydantic import BaseModel, Field, model_validator, ConfigDict
 from mcp.server.fastmcp import FastMCP
 
+try:
+    import orjson
+
+    def dump_json(data: Any) -> str:
+        """Serialize data as indented JSON using orjson."""
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+
+    def load_json(content: bytes) -> Any:
+        """Parse UTF-8 encoded JSON using orjson."""
+        return orjson.loads(content)
+
+except ImportError:
+
+    def dump_json(data: Any) -> str:
+        """Serialize data as indented JSON using the standard library."""
+        return json.dumps(data, indent=2, ensure_ascii=False)
+
+    def load_json(content: bytes) -> Any:
+        """Parse UTF-8 encoded JSON using the standard library."""
+        return json.loads(content)
+
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
 # Initialize FastMCP server
 mcp = FastMCP("systembolaget_mcp")
 
 # Constants
 CHARACTER_LIMIT = 25000
+TRUNCATION_NOTICE = "\n\n... [Response truncated. Try filtering results to see more details]"
 DEFAULT_PAGE_SIZE = 20
 MAX_PAGE_SIZE = 100
+THREADED_FORMAT_THRESHOLD = 32  # Format larger result pages off the event loop
 API_TIMEOUT = 30.0
 API_KEY_CACHE_DURATION = 3600  # 1 hour in seconds
+BUNDLE_PATH_CACHE_DURATION = 86400  # 24 hours in seconds
+SEARCH_CACHE_SIZE = 128
+SEARCH_CACHE_TTL = 60  # seconds
+DETAIL_CACHE_SIZE = 512
+DETAIL_CACHE_TTL = 600  # 10 minutes, so price and stock changes show up
+MAX_CONCURRENT_DETAIL_REQUESTS = 10
+MAX_CONNECTIONS = 64
+MAX_KEEPALIVE_CONNECTIONS = 20
+KEEPALIVE_EXPIRY = 30.0  # seconds
 
 # API Configuration
 SYSTEMBOLAGET_API_BASE = "https://api-extern.systembolaget.se/sb-api-ecommerce/v1"
 SYSTEMBOLAGET_WEBSITE = "https://www.systembolaget.se"
 
+RATE_LIMIT_RETRIES = 3
+MAX_RATE_LIMIT_WAIT = 30.0  # seconds
+MAX_CONCURRENT_API_REQUESTS = 16  # Must stay >= MAX_CONCURRENT_DETAIL_REQUESTS
+
 # Cached API key
 _cached_api_key: Optional[str] = None
 _api_key_timestamp: Optional[float] = None
 
+# API key refresh locks, one per event loop
+_refresh_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# Detail request semaphores, one per event loop
+_detail_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# Cached app bundle path
+_cached_bundle_path: Optional[str] = None
+_bundle_path_timestamp: Optional[float] = None
+
+# Shared HTTP client and the event loop it belongs to
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional["weakref.ref[asyncio.AbstractEventLoop]"] = None
+
+# Precompiled patterns for API key extraction
+# Both patterns are bytes so responses can be scanned without decoding them.
+# Matches: <script src="/_next/static/chunks/pages/_app-HASH.js">
+_APP_BUNDLE_RE = re.compile(rb'<script src="([^"]+_app-[^"]+\.js)"')
+# Matches: NEXT_PUBLIC_API_KEY_APIM:"key-value"
+_API_KEY_RE = re.compile(rb'NEXT_PUBLIC_API_KEY_APIM:"([^"]+)"')
+# Bytes carried over between bundle chunks; must exceed the length of a full match
+_API_KEY_SCAN_OVERLAP = 512
+
+# Taste clock fields in display order
+_TASTE_PROFILE = (
+    ("tasteClockBitter", "Bitterness"),
+    ("tasteClockSweetness", "Sweetness"),
+    ("tasteClockBody", "Body"),
+)
+_TASTE_KEYS = frozenset(key for key, _ in _TASTE_PROFILE)
+
+# Free-text product fields shown by get_product, with their section labels
+_PRODUCT_DETAIL_SECTIONS = (
+    ("description", "Description"),
+    ("taste", "Taste"),
+    ("usage", "Serving Suggestions"),
+)
+
+# SearchProductsInput fields and the product search API parameters they map to
+_PRODUCT_SEARCH_PARAMS = (
+    ("query", "searchQuery"),
+    ("category", "category"),
+    ("min_price", "minPrice"),
+    ("max_price", "maxPrice"),
+    ("min_alcohol", "minAlcohol"),
+    ("max_alcohol", "maxAlcohol"),
+    ("country", "country"),
+)
+
 
 class APIError(Exception):
     """Custom exception for API errors"""
@@ -43,14 +142,269 @@ class APIError(Exception):
     pass
 
 
+# Error messages for API status codes that need no special handling
+_STATUS_ERRORS = {
+    404: "Resource not found",
+    429: "Rate limit exceeded. Please try again later",
+}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either in seconds or as an HTTP date.
+
+    Args:
+        value: The header value, if present
+
+    Returns:
+        float | None: Seconds to wait, or None if missing or unparseable
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_rate_limit_reset(value: Optional[str]) -> Optional[float]:
+    """Parse an X-RateLimit-Reset header given in seconds or as a Unix timestamp.
+
+    Args:
+        value: The header value, if present
+
+    Returns:
+        float | None: Seconds until the limit resets, or None if missing or unparseable
+    """
+    try:
+        reset = float(value) if value else None
+    except ValueError:
+        return None
+    if reset is None:
+        return None
+    # Values this large are absolute Unix timestamps rather than durations
+    if reset > 1_000_000_000:
+        reset -= time.time()
+    return max(0.0, reset)
+
+
+_T = TypeVar("_T")
+
+
+def _get_loop_local(
+    registry: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _T]", factory: Callable[[], _T]
+) -> _T:
+    """Get the registry entry for the running event loop, creating it on first use.
+
+    asyncio primitives bind to the loop they are first used on, so state built
+    from them is kept per loop and dropped together with the loop.
+    """
+    loop = asyncio.get_running_loop()
+    value = registry.get(loop)
+    if value is None:
+        value = registry[loop] = factory()
+    return value
+
+
+class _LoopSlots:
+    """Concurrency slots in use on one event loop."""
+
+    def __init__(self) -> None:
+        self.condition = asyncio.Condition()
+        self.active = 0
+
+
+class RateLimiter:
+    """Adaptive client-side throttle for Systembolaget API requests.
+
+    Every response is fed back through record(). Retry-After and
+    X-RateLimit-Remaining/X-RateLimit-Reset headers pause new requests while
+    the API reports no spare capacity. The number of concurrent requests is
+    adjusted AIMD-style: it is halved on 429 and 5xx responses and grows back
+    by 0.5 after each request answered within the latency target.
+
+    By default it starts at max_concurrency (MAX_CONCURRENT_API_REQUESTS), so
+    on a cold start the limiter only holds requests back once the API pushes
+    back, and it never undercuts MAX_CONCURRENT_DETAIL_REQUESTS or HTTP/2
+    multiplexing before that.
+    """
+
+    def __init__(
+        self,
+        initial_concurrency: Optional[float] = None,
+        min_concurrency: int = 1,
+        max_concurrency: int = MAX_CONCURRENT_API_REQUESTS,
+        latency_target: float = 2.0,
+        low_remaining: int = 2,
+    ) -> None:
+        self.concurrency = (
+            float(max_concurrency) if initial_concurrency is None else initial_concurrency
+        )
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.latency_target = latency_target
+        self.low_remaining = low_remaining
+        self._paused_until = 0.0
+        # Slots and their condition bind to an event loop, so keep one set per loop
+        self._slots: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopSlots]
+        self._slots = weakref.WeakKeyDictionary()
+
+    def pause(self, seconds: float) -> None:
+        """Hold back new requests for the given number of seconds."""
+        seconds = min(seconds, MAX_RATE_LIMIT_WAIT)
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Wait until a request may be sent and hold a concurrency slot meanwhile."""
+        while (delay := self._paused_until - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+
+        slots = _get_loop_local(self._slots, _LoopSlots)
+        async with slots.condition:
+            await slots.condition.wait_for(lambda: slots.active < int(self.concurrency))
+            slots.active += 1
+        try:
+            yield
+        finally:
+            async with slots.condition:
+                slots.active -= 1
+                slots.condition.notify_all()
+
+    def record(self, response: httpx.Response, elapsed: float) -> None:
+        """Update the throttle from a response.
+
+        Args:
+            response: The API response
+            elapsed: Seconds the request took
+        """
+        status = response.status_code
+        if status == 429 or status >= 500:
+            self.concurrency = max(float(self.min_concurrency), self.concurrency / 2)
+        elif elapsed <= self.latency_target:
+            self.concurrency = min(float(self.max_concurrency), self.concurrency + 0.5)
+
+        retry_after = parse_retry_after(response.headers.get("retry-after"))
+        if retry_after is not None:
+            self.pause(retry_after)
+
+        remaining = response.headers.get("x-ratelimit-remaining")
+        if remaining is not None and remaining.isdigit() and int(remaining) <= self.low_remaining:
+            reset = parse_rate_limit_reset(response.headers.get("x-ratelimit-reset"))
+            self.pause(reset if reset is not None else 1.0)
+
+
+# Shared throttle for all API requests
+_rate_limiter = RateLimiter()
+
+
+def get_api_key_cache_file() -> Path:
+    """Get the path of the on-disk API key cache.
+
+    Returns:
+        Path: $XDG_CACHE_HOME/systembolaget-mcp/key.json (defaults to ~/.cache)
+    """
+    cache_home = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(cache_home) / "systembolaget-mcp" / "key.json"
+
+
+def load_persisted_api_key() -> Optional[tuple[str, float]]:
+    """Load the API key persisted by a previous run.
+
+    Returns:
+        tuple[str, float] | None: The key and the time it was extracted, or None
+        if no readable cache file exists
+    """
+    try:
+        data = json.loads(get_api_key_cache_file().read_text())
+        return str(data["key"]), float(data["ts"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def persist_api_key(api_key: str, timestamp: float) -> None:
+    """Write the API key to disk so the next process start can reuse it.
+
+    The file is written to a temporary path and moved into place so readers
+    never see a partial file. Failures are logged and otherwise ignored.
+
+    Args:
+        api_key: The extracted API key
+        timestamp: The time the key was extracted
+    """
+    cache_file = get_api_key_cache_file()
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(".tmp")
+        tmp_file.write_text(json.dumps({"key": api_key, "ts": timestamp}))
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        logger.warning("Could not persist API key to %s: %s", cache_file, e)
+
+
 def invalidate_api_key() -> None:
-    """Invalidate the cached API key to force re-extraction."""
-    global _cached_api_key, _api_key_timestamp
+    """Invalidate the cached API key to force re-extraction.
+
+    The cached bundle path and the persisted key are dropped as well, since a
+    rejected key usually means the website has been redeployed with a new bundle.
+    """
+    global _cached_api_key, _api_key_timestamp, _cached_bundle_path, _bundle_path_timestamp
     _cached_api_key = None
     _api_key_timestamp = None
+    _cached_bundle_path = None
+    _bundle_path_timestamp = None
+    try:
+        get_api_key_cache_file().unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning("Could not remove persisted API key: %s", e)
     logger.info("API key cache invalidated")
 
 
+def _get_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use.
+
+    Reusing one client keeps connections alive between tool calls instead of
+    opening a new TCP and TLS connection per request, and HTTP/2 lets
+    concurrent requests to the same host share a single connection.
+    Connections cannot be shared across event loops, so the client is rebuilt
+    if the running loop changes.
+
+    Returns:
+        httpx.AsyncClient: The shared client
+    """
+    global _client, _client_loop
+
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is None or _client_loop() is not loop:
+        # A client from another loop is dropped rather than closed on purpose: its
+        # connections belong to that loop, which may already be closed
+        _client = httpx.AsyncClient(
+            timeout=API_TIMEOUT,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+        )
+        _client_loop = weakref.ref(loop)
+        logger.debug("Created shared HTTP client")
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared HTTP client and release its connections."""
+    global _client, _client_loop
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+        logger.debug("Closed shared HTTP client")
+    _client = None
+    _client_loop = None
+
+
 async def get_app_bundle_path() -> str:
     """Extract the app bundle path from Systembolaget's main website.
 
@@ -61,108 +415,198 @@ async def get_app_bundle_path() -> str:
         APIError: If unable to fetch or parse the website
     """
     try:
-        async with httpx.AsyncClient(timeout=API_TIMEOUT) as client:
-            logger.debug(f"Fetching main website: {SYSTEMBOLAGET_WEBSITE}")
-            response = await client.get(SYSTEMBOLAGET_WEBSITE)
+        client = _get_client()
+        logger.debug("Fetching main website: %s", SYSTEMBOLAGET_WEBSITE)
+        response = await client.get(SYSTEMBOLAGET_WEBSITE)
 
-            if response.status_code != 200:
-                raise APIError(f"Failed to fetch Systembolaget website: {response.status_code}")
+        if response.status_code != 200:
+            raise APIError(f"Failed to fetch Systembolaget website: {response.status_code}")
 
-            # Extract app bundle path using regex
-            # Pattern matches: <script src="/_next/static/chunks/pages/_app-HASH.js">
-            pattern = r'<script src="([^"]+_app-[^"]+\.js)"'
-            match = re.search(pattern, response.text)
+        # Extract app bundle path using regex
+        match = _APP_BUNDLE_RE.search(response.content)
 
-            if not match:
-                raise APIError("Could not find app bundle path in website")
+        if not match:
+            raise APIError("Could not find app bundle path in website")
 
-            bundle_path = match.group(1)
-            logger.debug(f"Found app bundle path: {bundle_path}")
-            return bundle_path
+        bundle_path = match.group(1).decode()
+        logger.debug("Found app bundle path: %s", bundle_path)
+        return bundle_path
 
     except httpx.RequestError as e:
         raise APIError(f"Network error fetching website: {str(e)}")
 
 
-async def extract_api_key() -> str:
-    """Extract the API key from Systembolaget's app bundle.
+async def fetch_api_key_from_bundle(bundle_path: str) -> str:
+    """Fetch an app bundle and extract the API key from it.
 
-    This function fetches the main website, finds the app bundle script,
-    and extracts the NEXT_PUBLIC_API_KEY_APIM value. Keys are cached for
-    API_KEY_CACHE_DURATION seconds to minimize overhead.
+    Args:
+        bundle_path: Path or absolute URL of the app bundle JavaScript file
 
     Returns:
         str: The API key
 
     Raises:
-        APIError: If unable to extract the API key
+        APIError: If the bundle cannot be fetched or contains no API key
+        httpx.RequestError: On network errors
     """
-    import time
+    # Construct full URL
+    if bundle_path.startswith("http"):
+        bundle_url = bundle_path
+    else:
+        bundle_url = f"{SYSTEMBOLAGET_WEBSITE}{bundle_path}"
 
-    global _cached_api_key, _api_key_timestamp
+    # Stream the app bundle and stop reading as soon as the key is found
+    client = _get_client()
+    logger.debug("Fetching app bundle: %s", bundle_url)
+    async with client.stream("GET", bundle_url) as response:
+        if response.status_code != 200:
+            raise APIError(f"Failed to fetch app bundle: {response.status_code}")
 
-    # Return cached key if available and not expired
+        tail = b""
+        async for chunk in response.aiter_bytes():
+            # Keep the end of the previous chunk so a key split across chunks still matches
+            data = tail + chunk
+            match = _API_KEY_RE.search(data)
+            if match:
+                return match.group(1).decode()
+            tail = data[-_API_KEY_SCAN_OVERLAP:]
+
+    raise APIError("Could not find API key in app bundle")
+
+
+def _get_cached_api_key() -> Optional[str]:
+    """Get the in-memory API key if it has not expired.
+
+    Returns:
+        str | None: The cached API key, or None if missing or expired
+    """
     if _cached_api_key and _api_key_timestamp:
         age = time.time() - _api_key_timestamp
         if age < API_KEY_CACHE_DURATION:
-            logger.debug(f"Using cached API key (age: {age:.0f}s)")
+            logger.debug("Using cached API key (age: %.0fs)", age)
             return _cached_api_key
         else:
-            logger.info(f"API key cache expired (age: {age:.0f}s), refreshing")
+            logger.info("API key cache expired (age: %.0fs), refreshing", age)
+    return None
 
-    # Check environment variable first (optional override)
-    env_key = os.getenv("SYSTEMBOLAGET_API_KEY")
-    if env_key:
-        logger.info("Using API key from environment variable")
-        _cached_api_key = env_key
-        _api_key_timestamp = time.time()
-        return env_key
 
-    try:
-        logger.info("Extracting API key from website")
-        # Get app bundle path
-        bundle_path = await get_app_bundle_path()
+def _get_refresh_lock() -> asyncio.Lock:
+    """Get the API key refresh lock for the running event loop."""
+    return _get_loop_local(_refresh_locks, asyncio.Lock)
 
-        # Construct full URL
-        if bundle_path.startswith("http"):
-            bundle_url = bundle_path
-        else:
-            bundle_url = f"{SYSTEMBOLAGET_WEBSITE}{bundle_path}"
 
-        # Fetch the app bundle
-        async with httpx.AsyncClient(timeout=API_TIMEOUT) as client:
-            logger.debug(f"Fetching app bundle: {bundle_url}")
-            response = await client.get(bundle_url)
+async def extract_api_key() -> str:
+    """Extract the API key from Systembolaget's app bundle.
+
+    This function fetches the main website, finds the app bundle script,
+    and extracts the NEXT_PUBLIC_API_KEY_APIM value. Keys are cached for
+    API_KEY_CACHE_DURATION seconds to minimize overhead, both in memory and
+    on disk so that restarts can reuse them. The bundle path is cached for
+    BUNDLE_PATH_CACHE_DURATION seconds, so a key refresh can skip the website
+    fetch until the bundle stops serving a key.
+
+    Concurrent callers share a single refresh: one of them extracts the key
+    while the others wait for it and reuse the result.
 
-            if response.status_code != 200:
-                raise APIError(f"Failed to fetch app bundle: {response.status_code}")
+    Returns:
+        str: The API key
+
+    Raises:
+        APIError: If unable to extract the API key
+    """
+    global _cached_api_key, _api_key_timestamp, _cached_bundle_path, _bundle_path_timestamp
 
-            # Extract API key using regex
-            # Pattern matches: NEXT_PUBLIC_API_KEY_APIM:"key-value"
-            pattern = r'NEXT_PUBLIC_API_KEY_APIM:"([^"]+)"'
-            match = re.search(pattern, response.text)
+    # Return cached key if available and not expired
+    cached_key = _get_cached_api_key()
+    if cached_key:
+        return cached_key
+
+    async with _get_refresh_lock():
+        # Another caller may have refreshed the key while we were waiting
+        cached_key = _get_cached_api_key()
+        if cached_key:
+            return cached_key
+
+        # Check environment variable first (optional override)
+        env_key = os.getenv("SYSTEMBOLAGET_API_KEY")
+        if env_key:
+            logger.info("Using API key from environment variable")
+            _cached_api_key = env_key
+            _api_key_timestamp = time.time()
+            return env_key
+
+        # Reuse a key persisted by a previous run, keeping its original extraction time
+        persisted = load_persisted_api_key()
+        if persisted:
+            persisted_key, persisted_timestamp = persisted
+            age = time.time() - persisted_timestamp
+            if age < API_KEY_CACHE_DURATION:
+                logger.info("Using persisted API key (age: %.0fs)", age)
+                _cached_api_key = persisted_key
+                _api_key_timestamp = persisted_timestamp
+                return persisted_key
 
-            if not match:
-                raise APIError("Could not find API key in app bundle")
+        try:
+            logger.info("Extracting API key from website")
+            api_key: Optional[str] = None
+
+            # Try the known bundle first; it only changes when the website is redeployed
+            if _cached_bundle_path and _bundle_path_timestamp:
+                age = time.time() - _bundle_path_timestamp
+                if age < BUNDLE_PATH_CACHE_DURATION:
+                    try:
+                        api_key = await fetch_api_key_from_bundle(_cached_bundle_path)
+                    except APIError as e:
+                        logger.info("Cached app bundle unusable (%s), fetching website", e)
+
+            if api_key is None:
+                bundle_path = await get_app_bundle_path()
+                api_key = await fetch_api_key_from_bundle(bundle_path)
+                _cached_bundle_path = bundle_path
+                _bundle_path_timestamp = time.time()
 
-            api_key = match.group(1)
             _cached_api_key = api_key
             _api_key_timestamp = time.time()
+            persist_api_key(api_key, _api_key_timestamp)
             logger.info("API key extracted and cached successfully")
             return api_key
 
-    except httpx.RequestError as e:
-        raise APIError(f"Network error extracting API key: {str(e)}")
+        except httpx.RequestError as e:
+            raise APIError(f"Network error extracting API key: {str(e)}")
+
+
+@lru_cache(maxsize=8)
+def get_api_headers(api_key: str, origin: Optional[str] = None) -> Mapping[str, str]:
+    """Get the request headers for authenticating against the API.
+
+    Headers are built once per key and origin and shared between requests,
+    so they are returned read-only.
+
+    Args:
+        api_key: The API key
+        origin: Optional Origin header value
+
+    Returns:
+        Mapping[str, str]: Read-only request headers
+    """
+    headers = {"Ocp-Apim-Subscription-Key": api_key}
+    if origin:
+        headers["Origin"] = origin
+    return MappingProxyType(headers)
 
 
 async def make_api_request(
     url: str,
     params: Optional[dict[str, Any]] = None,
-    headers: Optional[dict[str, str]] = None,
+    headers: Optional[Mapping[str, str]] = None,
     retry_on_403: bool = True,
 ) -> dict[str, Any]:
     """Make an async HTTP request to Systembolaget API with error handling.
 
+    Requests pass through the shared RateLimiter, and responses with status
+    429 are retried up to RATE_LIMIT_RETRIES times after the advertised
+    Retry-After delay (or an exponential backoff).
+
     Args:
         url: The API endpoint URL
         params: Query parameters
@@ -176,13 +620,30 @@ async def make_api_request(
         APIError: If the request fails
     """
     try:
-        async with httpx.AsyncClient(timeout=API_TIMEOUT) as client:
-            logger.debug(f"API request: {url}")
-            response = await client.get(url, params=params, headers=headers)
+        client = _get_client()
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            async with _rate_limiter.slot():
+                logger.debug("API request: %s", url)
+                started = time.monotonic()
+                response = await client.get(url, params=params, headers=headers)
+                _rate_limiter.record(response, time.monotonic() - started)
+
+            if response.status_code != 429 or attempt == RATE_LIMIT_RETRIES:
+                break
 
-            if response.status_code == 404:
-                raise APIError("Resource not found")
-            elif response.status_code == 403:
+            # Back off exponentially unless the API said how long to wait
+            if parse_retry_after(response.headers.get("retry-after")) is None:
+                _rate_limiter.pause(2**attempt)
+            logger.warning(
+                "Rate limited by API, retrying (attempt %d of %d)", attempt + 1, RATE_LIMIT_RETRIES
+            )
+
+        status = response.status_code
+        if status != 200:
+            message = _STATUS_ERRORS.get(status)
+            if message is not None:
+                raise APIError(message)
+            elif status == 403:
                 # API key might be invalid, try refreshing once
                 if retry_on_403:
                     logger.warning("Got 403 response, invalidating API key and retrying")
@@ -191,20 +652,70 @@ async def make_api_request(
                     raise APIError("Access forbidden. API key may be invalid - please retry")
                 else:
                     raise APIError("Access forbidden. Check API key configuration")
-            elif response.status_code == 429:
-                raise APIError("Rate limit exceeded. Please try again later")
-            elif response.status_code >= 500:
+            elif status >= 500:
                 raise APIError("Systembolaget API is currently unavailable")
-            elif response.status_code != 200:
-                raise APIError(f"API request failed with status {response.status_code}")
+            else:
+                raise APIError(f"API request failed with status {status}")
 
-            return response.json()
+        return load_json(response.content)  # type: ignore[no-any-return]
     except httpx.TimeoutException:
         raise APIError("Request timed out. Please try again")
     except httpx.RequestError as e:
         raise APIError(f"Network error: {str(e)}")
 
 
+def _get_detail_semaphore() -> asyncio.Semaphore:
+    """Get the semaphore bounding concurrent detail requests on the running event loop."""
+    return _get_loop_local(
+        _detail_semaphores, lambda: asyncio.Semaphore(MAX_CONCURRENT_DETAIL_REQUESTS)
+    )
+
+
+@alru_cache(maxsize=DETAIL_CACHE_SIZE, ttl=DETAIL_CACHE_TTL)
+async def _fetch_product(product_number: str) -> dict[str, Any]:
+    """Fetch a product by product number. Results are cached; errors are not cached."""
+    # Get API key (automatically extracted from website)
+    api_key = await extract_api_key()
+
+    url = f"{SYSTEMBOLAGET_API_BASE}/product/{product_number}"
+    async with _get_detail_semaphore():
+        return await make_api_request(url, headers=get_api_headers(api_key))
+
+
+async def fetch_products(
+    product_numbers: list[str],
+) -> list[dict[str, Any] | BaseException]:
+    """Fetch several products concurrently.
+
+    Requests run in parallel, at most MAX_CONCURRENT_DETAIL_REQUESTS at a
+    time, and share the product cache with get_product. Each request also
+    passes through the shared rate limiter, which lowers concurrency further
+    after 429 or 5xx responses, so uncached products take roughly
+    len(product_numbers) / MAX_CONCURRENT_DETAIL_REQUESTS round trips, or
+    more while the API is pushing back.
+
+    Args:
+        product_numbers: Product numbers to fetch
+
+    Returns:
+        list: Product data or the raised exception for each product number, in order
+    """
+    return await asyncio.gather(
+        *(_fetch_product(product_number) for product_number in product_numbers),
+        return_exceptions=True,
+    )
+
+
+@alru_cache(maxsize=DETAIL_CACHE_SIZE, ttl=DETAIL_CACHE_TTL)
+async def _fetch_store(store_id: str) -> dict[str, Any]:
+    """Fetch a store by site ID. Results are cached; errors are not cached."""
+    # Get API key (automatically extracted from website)
+    api_key = await extract_api_key()
+
+    url = f"{SYSTEMBOLAGET_API_BASE}/site/{store_id}"
+    return await make_api_request(url, headers=get_api_headers(api_key))
+
+
 def format_product_markdown(product: dict[str, Any]) -> str:
     """Format a product as markdown for human readability.
 
@@ -214,41 +725,35 @@ def format_product_markdown(product: dict[str, Any]) -> str:
     Returns:
         str: Formatted markdown string
     """
-    name = product.get("productNameBold", "Unknown")
-    subtitle = product.get("productNameThin", "")
-    price = product.get("price", "N/A")
-    volume = product.get("volume", "N/A")
-    alcohol = product.get("alcoholPercentage", "N/A")
-    product_number = product.get("productNumber", "N/A")
-    category = product.get("categoryLevel1", "N/A")
-
-    md = f"### {name}"
-    if subtitle:
-        md += f" - {subtitle}"
-    md += "\n\n"
-    md += f"- **Product Number:** {product_number}\n"
-    md += f"- **Price:** {price} SEK\n"
-    md += f"- **Volume:** {volume} ml\n"
-    md += f"- **Alcohol:** {alcohol}%\n"
-    md += f"- **Category:** {category}\n"
+    get = product.get
+    name = get("productNameBold", "Unknown")
+    subtitle = get("productNameThin", "")
+    title = f"{name} - {subtitle}" if subtitle else name
+
+    header = (
+        f"### {title}\n\n"
+        f"- **Product Number:** {get('productNumber', 'N/A')}\n"
+        f"- **Price:** {get('price', 'N/A')} SEK\n"
+        f"- **Volume:** {get('volume', 'N/A')} ml\n"
+        f"- **Alcohol:** {get('alcoholPercentage', 'N/A')}%\n"
+        f"- **Category:** {get('categoryLevel1', 'N/A')}\n"
+    )
+    parts = [header]
 
     # Add additional details if available
     if "country" in product:
-        md += f"- **Country:** {product['country']}\n"
+        parts.append(f"- **Country:** {product['country']}\n")
     if "assortmentText" in product:
-        md += f"- **Assortment:** {product['assortmentText']}\n"
+        parts.append(f"- **Assortment:** {product['assortmentText']}\n")
 
     # Taste profile if available
-    if any(key in product for key in ["tasteClockBitter", "tasteClockSweetness", "tasteClockBody"]):
-        md += "\n**Taste Profile:**\n"
-        if "tasteClockBitter" in product:
-            md += f"- Bitterness: {product['tasteClockBitter']}/12\n"
-        if "tasteClockSweetness" in product:
-            md += f"- Sweetness: {product['tasteClockSweetness']}/12\n"
-        if "tasteClockBody" in product:
-            md += f"- Body: {product['tasteClockBody']}/12\n"
+    if not product.keys().isdisjoint(_TASTE_KEYS):
+        parts.append("\n**Taste Profile:**\n")
+        for key, label in _TASTE_PROFILE:
+            if key in product:
+                parts.append(f"- {label}: {product[key]}/12\n")
 
-    return md
+    return "".join(parts)
 
 
 def format_store_markdown(store: dict[str, Any]) -> str:
@@ -260,14 +765,13 @@ def format_store_markdown(store: dict[str, Any]) -> str:
     Returns:
         str: Formatted markdown string
     """
-    name = store.get("displayName", store.get("alias", "Unknown"))
-    store_id = store.get("siteId", "N/A")
-    street = store.get("streetAddress", "")
-    city = store.get("city", "")
-    postal_code = store.get("postalCode", "")
+    get = store.get
+    name = get("displayName", get("alias", "Unknown"))
+    street = get("streetAddress", "")
+    city = get("city", "")
+    postal_code = get("postalCode", "")
 
-    md = f"### {name}\n\n"
-    md += f"- **Store ID:** {store_id}\n"
+    parts = [f"### {name}\n\n", f"- **Store ID:** {get('siteId', 'N/A')}\n"]
 
     if street:
         address_parts = [street]
@@ -275,30 +779,69 @@ def format_store_markdown(store: dict[str, Any]) -> str:
             address_parts.append(postal_code)
         if city:
             address_parts.append(city)
-        md += f"- **Address:** {' '.join(address_parts)}\n"
+        parts.append(f"- **Address:** {' '.join(address_parts)}\n")
 
-    if store.get("isAgent"):
-        md += "- **Type:** Agent\n"
-    if store.get("isTastingStore"):
-        md += "- **Features:** Tasting Store\n"
+    if get("isAgent"):
+        parts.append("- **Type:** Agent\n")
+    if get("isTastingStore"):
+        parts.append("- **Features:** Tasting Store\n")
 
     # Opening hours - show today's hours
-    if "openingHours" in store and len(store["openingHours"]) > 0:
+    opening_hours = get("openingHours")
+    if opening_hours:
         # Find today's hours (usually second entry is today)
-        for day_info in store["openingHours"][:3]:  # Check first few days
+        for day_info in opening_hours[:3]:  # Check first few days
             if day_info.get("openFrom") != "00:00:00":
                 open_from = day_info.get("openFrom", "")[:5]  # HH:MM
                 open_to = day_info.get("openTo", "")[:5]
-                md += f"- **Hours:** {open_from} - {open_to}\n"
+                parts.append(f"- **Hours:** {open_from} - {open_to}\n")
                 break
 
     if "position" in store:
         lat = store["position"].get("latitude")
         lon = store["position"].get("longitude")
         if lat and lon:
-            md += f"- **Location:** {lat:.4f}, {lon:.4f}\n"
+            parts.append(f"- **Location:** {lat:.4f}, {lon:.4f}\n")
+
+    return "".join(parts)
+
+
+async def render_markdown_list(
+    items: list[dict[str, Any]],
+    formatter: Callable[[dict[str, Any]], str],
+    limit: int = CHARACTER_LIMIT,
+) -> str:
+    """Format a list of items as markdown sections separated by blank lines.
 
-    return md
+    Formatting stops once the output exceeds limit characters, since
+    truncate_response cuts everything past it anyway. Lists longer than
+    THREADED_FORMAT_THRESHOLD are formatted in a worker thread so the event
+    loop can keep serving other tool calls meanwhile.
+
+    Args:
+        items: Data dictionaries to format
+        formatter: Function formatting a single item as markdown
+        limit: Character limit the output will be truncated to
+
+    Returns:
+        str: Formatted markdown string
+    """
+    separator = "\n\n"
+
+    def render() -> str:
+        sections: list[str] = []
+        length = -len(separator)
+        for item in items:
+            section = formatter(item)
+            sections.append(section)
+            length += len(separator) + len(section)
+            if length > limit:
+                break
+        return separator.join(sections)
+
+    if len(items) > THREADED_FORMAT_THRESHOLD:
+        return await asyncio.to_thread(render)
+    return render()
 
 
 def truncate_response(content: str, limit: int = CHARACTER_LIMIT) -> str:
@@ -316,15 +859,17 @@ def truncate_response(content: str, limit: int = CHARACTER_LIMIT) -> str:
     if len(content) <= limit:
         return content
 
-    # Try to truncate at last complete line to preserve formatting
-    truncate_point = content.rfind("\n", 0, limit)
-    if truncate_point > limit * 0.8:  # If we're within 80% of limit
+    # Try to truncate at last complete line to preserve formatting. Only the
+    # final 20% before the limit is searched, so a missing line break costs
+    # a short scan instead of one over the whole response.
+    truncate_point = content.rfind("\n", int(limit * 0.8) + 1, limit)
+    if truncate_point != -1:
         truncated = content[:truncate_point]
     else:
         # Fall back to simple truncation if no good line break found
         truncated = content[:limit]
 
-    return f"{truncated}\n\n... [Response truncated. Try filtering results to see more details]"
+    return f"{truncated}{TRUNCATION_NOTICE}"
 
 
 # Input Models
@@ -333,7 +878,8 @@ def truncate_response(content: str, limit: int = CHARACTER_LIMIT) -> str:
 class SearchProductsInput(BaseModel):
     """Input model for searching products."""
 
-    model_config = ConfigDict(str_strip_whitespace=True)
+    # Frozen so searches can be used as cache keys
+    model_config = ConfigDict(str_strip_whitespace=True, frozen=True)
 
     query: Optional[str] = Field(None, description="Search query for product name or description")
     category: Optional[str] = Field(
@@ -360,21 +906,15 @@ class SearchProductsInput(BaseModel):
         description="Response format: 'markdown' for human-readable or 'json' for structured data",
     )
 
-    @field_validator("max_price")
-    @classmethod
-    def validate_max_price(cls, v, info):
-        if v is not None and info.data.get("min_price") is not None:
-            if v < info.data["min_price"]:
+    @model_validator(mode="after")
+    def validate_ranges(self) -> "SearchProductsInput":
+        if self.min_price is not None and self.max_price is not None:
+            if self.max_price < self.min_price:
                 raise ValueError("max_price must be greater than or equal to min_price")
-        return v
-
-    @field_validator("max_alcohol")
-    @classmethod
-    def validate_max_alcohol(cls, v, info):
-        if v is not None and info.data.get("min_alcohol") is not None:
-            if v < info.data["min_alcohol"]:
+        if self.min_alcohol is not None and self.max_alcohol is not None:
+            if self.max_alcohol < self.min_alcohol:
                 raise ValueError("max_alcohol must be greater than or equal to min_alcohol")
-        return v
+        return self
 
 
 class GetProductInput(BaseModel):
@@ -392,7 +932,8 @@ class GetProductInput(BaseModel):
 class SearchStoresInput(BaseModel):
     """Input model for searching stores."""
 
-    model_config = ConfigDict(str_strip_whitespace=True)
+    # Frozen so searches can be used as cache keys
+    model_config = ConfigDict(str_strip_whitespace=True, frozen=True)
 
     query: Optional[str] = Field(None, description="Search query for store name or location")
     city: Optional[str] = Field(None, description="Filter by city")
@@ -439,10 +980,10 @@ def handle_tool_errors(func: Callable[..., Any]) -> Callable[..., Any]:
         try:
             return await func(*args, **kwargs)  # type: ignore[no-any-return]
         except APIError as e:
-            logger.error(f"API error in {func.__name__}: {str(e)}")
+            logger.error("API error in %s: %s", func.__name__, e)
             return f"Error: {str(e)}"
         except Exception as e:
-            logger.exception(f"Unexpected error in {func.__name__}")
+            logger.exception("Unexpected error in %s", func.__name__)
             return f"Unexpected error: {str(e)}"
 
     return wrapper  # type: ignore[return-value]
@@ -466,28 +1007,23 @@ async def search_products(params: SearchProductsInput) -> str:
     Returns:
         str: Formatted list of matching products with details
     """
-    logger.info(f"Searching products: query={params.query}, category={params.category}")
+    return await _search_products(params)
+
+
+@alru_cache(maxsize=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL)
+async def _search_products(params: SearchProductsInput) -> str:
+    """Run a product search. Results are cached briefly; errors are not cached."""
+    logger.info("Searching products: query=%s, category=%s", params.query, params.category)
 
     # Get API key (automatically extracted from website)
     api_key = await extract_api_key()
 
-    # Build query parameters
-    query_params: dict[str, Any] = {}
-
-    if params.query:
-        query_params["searchQuery"] = params.query
-    if params.category:
-        query_params["category"] = params.category
-    if params.min_price is not None:
-        query_params["minPrice"] = params.min_price
-    if params.max_price is not None:
-        query_params["maxPrice"] = params.max_price
-    if params.min_alcohol is not None:
-        query_params["minAlcohol"] = params.min_alcohol
-    if params.max_alcohol is not None:
-        query_params["maxAlcohol"] = params.max_alcohol
-    if params.country:
-        query_params["country"] = params.country
+    # Build query parameters (empty strings are treated as unset)
+    query_params: dict[str, Any] = {
+        api_name: value
+        for field_name, api_name in _PRODUCT_SEARCH_PARAMS
+        if (value := getattr(params, field_name)) is not None and value != ""
+    }
 
     # Note: API uses page-based pagination. We convert offset to page number.
     # For best results, use offset values that are multiples of limit.
@@ -496,15 +1032,17 @@ async def search_products(params: SearchProductsInput) -> str:
     query_params["pageSize"] = params.limit
 
     # Make API request
-    headers = {"Ocp-Apim-Subscription-Key": api_key}
+    headers = get_api_headers(api_key)
 
     url = f"{SYSTEMBOLAGET_API_BASE}/productsearch/search"
     data = await make_api_request(url, params=query_params, headers=headers)
 
     products = data.get("products", [])
-    total_count = data.get("metadata", {}).get("totalCount", len(products))
+    shown = len(products)
+    total_count = data.get("metadata", {}).get("totalCount", shown)
+    has_more = params.offset + shown < total_count
 
-    logger.info(f"Found {total_count} products, returning {len(products)}")
+    logger.info("Found %s products, returning %d", total_count, shown)
 
     if params.format == "json":
         result = {
@@ -513,28 +1051,26 @@ async def search_products(params: SearchProductsInput) -> str:
                 "limit": params.limit,
                 "offset": params.offset,
                 "total_count": total_count,
-                "returned_count": len(products),
-                "has_more": params.offset + len(products) < total_count,
+                "returned_count": shown,
+                "has_more": has_more,
             },
         }
-        return truncate_response(json.dumps(result, indent=2, ensure_ascii=False))
+        return truncate_response(dump_json(result))
 
     # Markdown format
     if not products:
         return "No products found matching your criteria."
 
-    result = "# Product Search Results\n\n"
-    result += f"Found {total_count} products (showing {len(products)})\n\n"
-
-    for product in products:
-        result += format_product_markdown(product) + "\n\n"
+    header = f"# Product Search Results\n\nFound {total_count} products (showing {shown})\n\n"
+    body = await render_markdown_list(products, format_product_markdown)
 
     # Pagination info
-    if params.offset + len(products) < total_count:
+    footer = ""
+    if has_more:
         next_offset = params.offset + params.limit
-        result += f"\n---\n**More results available.** Use `offset: {next_offset}` to see the next page.\n"
+        footer = f"\n---\n**More results available.** Use `offset: {next_offset}` to see the next page.\n"
 
-    return truncate_response(result)
+    return truncate_response(f"{header}{body}\n\n{footer}")
 
 
 @mcp.tool(name="systembolaget_get_product", annotations={"readOnlyHint": True})
@@ -551,38 +1087,28 @@ async def get_product(params: GetProductInput) -> str:
     Returns:
         str: Detailed product information
     """
-    logger.info(f"Getting product: {params.product_number}")
+    logger.info("Getting product: %s", params.product_number)
 
-    # Get API key (automatically extracted from website)
-    api_key = await extract_api_key()
-
-    headers = {"Ocp-Apim-Subscription-Key": api_key}
-
-    url = f"{SYSTEMBOLAGET_API_BASE}/product/{params.product_number}"
-    product = await make_api_request(url, headers=headers)
+    product = await _fetch_product(params.product_number)
 
     if params.format == "json":
-        return truncate_response(json.dumps(product, indent=2, ensure_ascii=False))
+        return truncate_response(dump_json(product))
 
     # Markdown format with full details
-    result = format_product_markdown(product)
+    parts = [format_product_markdown(product)]
 
     # Add extended information
-    if "description" in product:
-        result += f"\n**Description:**\n{product['description']}\n"
-
-    if "taste" in product:
-        result += f"\n**Taste:**\n{product['taste']}\n"
+    for key, label in _PRODUCT_DETAIL_SECTIONS:
+        value = product.get(key)
+        if value:
+            parts.append(f"\n**{label}:**\n{value}\n")
 
-    if "usage" in product:
-        result += f"\n**Serving Suggestions:**\n{product['usage']}\n"
+    taste_symbols = product.get("tasteSymbols")
+    if taste_symbols:
+        parts.append("\n**Food Pairings:**\n")
+        parts.extend(f"- {symbol}\n" for symbol in taste_symbols)
 
-    if "tasteSymbols" in product and product["tasteSymbols"]:
-        result += "\n**Food Pairings:**\n"
-        for symbol in product["tasteSymbols"]:
-            result += f"- {symbol}\n"
-
-    return truncate_response(result)
+    return truncate_response("".join(parts))
 
 
 @mcp.tool(name="systembolaget_search_stores", annotations={"readOnlyHint": True})
@@ -602,12 +1128,18 @@ async def search_stores(params: SearchStoresInput) -> str:
     Returns:
         str: List of matching stores with details
     """
-    logger.info(f"Searching stores: query={params.query}, city={params.city}")
+    return await _search_stores(params)
+
+
+@alru_cache(maxsize=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL)
+async def _search_stores(params: SearchStoresInput) -> str:
+    """Run a store search. Results are cached briefly; errors are not cached."""
+    logger.info("Searching stores: query=%s, city=%s", params.query, params.city)
 
     # Get API key (automatically extracted from website)
     api_key = await extract_api_key()
 
-    headers = {"Ocp-Apim-Subscription-Key": api_key, "Origin": "https://www.systembolaget.se"}
+    headers = get_api_headers(api_key, origin=SYSTEMBOLAGET_WEBSITE)
 
     query_params: dict[str, Any] = {"includePredictions": "true"}
 
@@ -628,10 +1160,14 @@ async def search_stores(params: SearchStoresInput) -> str:
 
     # Note: API doesn't support pagination parameters, so we fetch all results
     # and paginate client-side. For large result sets, consider using more specific queries.
+    # Only the requested page is formatted or serialized below.
     total_count = len(stores)
-    paginated_stores = stores[params.offset : params.offset + params.limit]
+    page_end = params.offset + params.limit
+    paginated_stores = stores[params.offset : page_end]
+    shown = len(paginated_stores)
+    has_more = page_end < total_count
 
-    logger.info(f"Found {total_count} stores, returning {len(paginated_stores)}")
+    logger.info("Found %d stores, returning %d", total_count, shown)
 
     if params.format == "json":
         result = {
@@ -640,28 +1176,27 @@ async def search_stores(params: SearchStoresInput) -> str:
                 "limit": params.limit,
                 "offset": params.offset,
                 "total_count": total_count,
-                "returned_count": len(paginated_stores),
-                "has_more": params.offset + params.limit < total_count,
+                "returned_count": shown,
+                "has_more": has_more,
             },
         }
-        return truncate_response(json.dumps(result, indent=2, ensure_ascii=False))
+        return truncate_response(dump_json(result))
 
     # Markdown format
     if not paginated_stores:
         return "No stores found matching your criteria."
 
-    result = "# Store Search Results\n\n"
-    result += f"Found {total_count} stores (showing {len(paginated_stores)})\n\n"
-
-    for store in paginated_stores:
-        result += format_store_markdown(store) + "\n\n"
+    header = f"# Store Search Results\n\nFound {total_count} stores (showing {shown})\n\n"
+    body = await render_markdown_list(paginated_stores, format_store_markdown)
 
     # Pagination info
-    if params.offset + params.limit < total_count:
-        next_offset = params.offset + params.limit
-        result += f"\n---\n**More results available.** Use `offset: {next_offset}` to see the next page.\n"
+    footer = ""
+    if has_more:
+        footer = (
+            f"\n---\n**More results available.** Use `offset: {page_end}` to see the next page.\n"
+        )
 
-    return truncate_response(result)
+    return truncate_response(f"{header}{body}\n\n{footer}")
 
 
 # Note: Individual store lookup endpoint not available in current API.
@@ -689,40 +1224,52 @@ async def get_store(params: GetStoreInput) -> str:
     Returns:
         str: Detailed store information
     """
-    logger.info(f"Getting store: {params.store_id}")
+    logger.info("Getting store: %s", params.store_id)
 
-    # Get API key (automatically extracted from website)
-    api_key = await extract_api_key()
-
-    headers = {"Ocp-Apim-Subscription-Key": api_key}
-
-    url = f"{SYSTEMBOLAGET_API_BASE}/site/{params.store_id}"
-    store = await make_api_request(url, headers=headers)
+    store = await _fetch_store(params.store_id)
 
     if params.format == "json":
-        return truncate_response(json.dumps(store, indent=2, ensure_ascii=False))
+        return truncate_response(dump_json(store))
 
     # Markdown format with full details
-    result = format_store_markdown(store)
+    parts = [format_store_markdown(store)]
 
     # Add extended information
     if "services" in store and store["services"]:
-        result += "\n**Services:**\n"
-        for service in store["services"]:
-            result += f"- {service}\n"
+        parts.append("\n**Services:**\n")
+        parts.extend(f"- {service}\n" for service in store["services"])
 
     if "parkingInfo" in store:
-        result += f"\n**Parking:** {store['parkingInfo']}\n"
+        parts.append(f"\n**Parking:** {store['parkingInfo']}\n")
 
     if "publicTransport" in store:
-        result += f"\n**Public Transport:** {store['publicTransport']}\n"
+        parts.append(f"\n**Public Transport:** {store['publicTransport']}\n")
+
+    return truncate_response("".join(parts))
 
-    return truncate_response(result)
+
+async def run_server() -> None:
+    """Run the MCP server over stdio and close the shared HTTP client on exit.
+
+    The client is closed here rather than in a FastMCP lifespan, which is
+    entered once per session and would close the client under other sessions.
+    """
+    try:
+        await mcp.run_stdio_async()
+    finally:
+        await close_client()
 
 
 def main() -> None:
     """Main entry point for the MCP server."""
-    mcp.run()
+    # Use the faster uvloop event loop when it is installed (speedups extra)
+    try:
+        import uvloop  # type: ignore[import-not-found, unused-ignore]
+    except ImportError:
+        pass
+    else:
+        uvloop.install()
+    asyncio.run(run_server())
 
 
 if __name__ == "__main__":
@@ -5,7 +5,12 @@ This test suite validates the MCP server tools by calling them directly
 without going through the JSON-RPC protocol.
 """
 
+import asyncio
+from types import SimpleNamespace
+
+import httpx
 import pytest
+import systembolaget_mcp
 from systembolaget_mcp import (
     search_products,
     get_product,
@@ -13,9 +18,21 @@ from systembolaget_mcp import (
     SearchProductsInput,
     GetProductInput,
     SearchStoresInput,
+    format_product_markdown,
+    format_store_markdown,
+    render_markdown_list,
+    truncate_response,
+    TRUNCATION_NOTICE,
 )
 
 
+@pytest.fixture(autouse=True)
+def cache_home(monkeypatch, tmp_path):
+    """Keep the persisted API key out of the user's cache directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    return tmp_path
+
+
 class TestProductSearch:
     """Tests for product search functionality."""
 
@@ -181,6 +198,432 @@ class TestInputValidation:
             SearchProductsInput(query="öl", limit=101)
 
 
+class TestFormatting:
+    """Tests for markdown formatting helpers."""
+
+    def test_format_product_markdown(self):
+        """Test product formatting includes core fields and taste profile."""
+        product = {
+            "productNameBold": "Norrlands Guld",
+            "productNameThin": "Export",
+            "productNumber": "1234",
+            "price": 19.9,
+            "volume": 500,
+            "alcoholPercentage": 5.3,
+            "categoryLevel1": "Öl",
+            "country": "Sverige",
+            "tasteClockBitter": 4,
+            "tasteClockBody": 6,
+        }
+
+        result = format_product_markdown(product)
+
+        assert result.startswith("### Norrlands Guld - Export\n\n")
+        assert "- **Product Number:** 1234\n" in result
+        assert "- **Price:** 19.9 SEK\n" in result
+        assert "- **Country:** Sverige\n" in result
+        assert "\n**Taste Profile:**\n- Bitterness: 4/12\n- Body: 6/12\n" in result
+        assert "Sweetness" not in result
+
+    def test_format_product_markdown_missing_fields(self):
+        """Test product formatting falls back to placeholders."""
+        result = format_product_markdown({})
+
+        assert result.startswith("### Unknown\n\n")
+        assert "- **Price:** N/A SEK\n" in result
+        assert "Taste Profile" not in result
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("count", [3, 50])
+    async def test_render_markdown_list(self, count):
+        """Test that small and large (threaded) pages render identically."""
+        products = [{"productNameBold": f"Product {i}"} for i in range(count)]
+
+        result = await render_markdown_list(products, format_product_markdown)
+
+        assert result == "\n\n".join(format_product_markdown(p) for p in products)
+
+    @pytest.mark.asyncio
+    async def test_render_markdown_list_stops_at_limit(self):
+        """Test that items past the character limit are not formatted."""
+        products = [{"productNameBold": f"Product {i}"} for i in range(100)]
+        formatted = []
+
+        def formatter(product):
+            formatted.append(product)
+            return format_product_markdown(product)
+
+        result = await render_markdown_list(products, formatter, limit=1000)
+        full = "\n\n".join(format_product_markdown(p) for p in products)
+
+        assert len(formatted) < len(products)
+        assert truncate_response(result, limit=1000) == truncate_response(full, limit=1000)
+
+    def test_format_store_markdown(self):
+        """Test store formatting includes address, hours and location."""
+        store = {
+            "displayName": "Stockholm Vasagatan",
+            "siteId": "0102",
+            "streetAddress": "Vasagatan 25",
+            "postalCode": "111 20",
+            "city": "Stockholm",
+            "openingHours": [
+                {"openFrom": "00:00:00", "openTo": "00:00:00"},
+                {"openFrom": "10:00:00", "openTo": "19:00:00"},
+            ],
+            "position": {"latitude": 59.33331, "longitude": 18.05712},
+        }
+
+        result = format_store_markdown(store)
+
+        assert result.startswith("### Stockholm Vasagatan\n\n- **Store ID:** 0102\n")
+        assert "- **Address:** Vasagatan 25 111 20 Stockholm\n" in result
+        assert "- **Hours:** 10:00 - 19:00\n" in result
+        assert "- **Location:** 59.3333, 18.0571\n" in result
+
+
+class TestResponseCache:
+    """Offline tests for caching of search results and details."""
+
+    @pytest.fixture
+    def api(self, monkeypatch):
+        """Stub out the API, recording request URLs and failing on demand."""
+        calls = []
+        state = {"fail": False}
+
+        async def fake_extract_api_key():
+            return "test-key"
+
+        async def fake_make_api_request(url, params=None, headers=None, **kwargs):
+            calls.append(url)
+            if state["fail"]:
+                raise systembolaget_mcp.APIError("Systembolaget API is currently unavailable")
+            return {"products": [{"productNameBold": "Cached"}], "metadata": {"totalCount": 1}}
+
+        monkeypatch.setattr(systembolaget_mcp, "extract_api_key", fake_extract_api_key)
+        monkeypatch.setattr(systembolaget_mcp, "make_api_request", fake_make_api_request)
+        systembolaget_mcp._search_products.cache_clear()
+        systembolaget_mcp._fetch_product.cache_clear()
+        yield calls, state
+        systembolaget_mcp._search_products.cache_clear()
+        systembolaget_mcp._fetch_product.cache_clear()
+
+    @pytest.mark.asyncio
+    async def test_repeated_search_is_cached(self, api):
+        """Test that an identical search is answered from the cache."""
+        calls, _ = api
+
+        first = await search_products(SearchProductsInput(query="öl"))
+        second = await search_products(SearchProductsInput(query="öl"))
+        await search_products(SearchProductsInput(query="vin"))
+
+        assert first == second
+        assert "Cached" in first
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_product_details_are_cached_across_formats(self, api):
+        """Test that a product is fetched once for both output formats."""
+        calls, _ = api
+
+        await get_product(GetProductInput(product_number="1234"))
+        await get_product(GetProductInput(product_number="1234", format="json"))
+
+        assert calls == [f"{systembolaget_mcp.SYSTEMBOLAGET_API_BASE}/product/1234"]
+
+    @pytest.mark.asyncio
+    async def test_fetch_products_bounds_concurrency(self, monkeypatch):
+        """Test that bulk fetches run concurrently through the real request path."""
+        state = {"active": 0, "peak": 0}
+
+        async def fake_extract_api_key():
+            return "test-key"
+
+        async def handler(request):
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(0.01)
+            state["active"] -= 1
+            product_number = request.url.path.rsplit("/", 1)[1]
+            if product_number == "bad":
+                return httpx.Response(404)
+            return httpx.Response(200, json={"productNumber": product_number})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(systembolaget_mcp, "extract_api_key", fake_extract_api_key)
+        monkeypatch.setattr(systembolaget_mcp, "_get_client", lambda: client)
+        monkeypatch.setattr(systembolaget_mcp, "_rate_limiter", systembolaget_mcp.RateLimiter())
+        systembolaget_mcp._fetch_product.cache_clear()
+
+        numbers = [str(i) for i in range(25)] + ["bad"]
+        results = await systembolaget_mcp.fetch_products(numbers)
+        systembolaget_mcp._fetch_product.cache_clear()
+        await client.aclose()
+
+        assert [r["productNumber"] for r in results[:-1]] == numbers[:-1]
+        assert isinstance(results[-1], systembolaget_mcp.APIError)
+        # The rate limiter starts above the detail bound, so the bound is reached
+        assert state["peak"] == systembolaget_mcp.MAX_CONCURRENT_DETAIL_REQUESTS
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self, api):
+        """Test that a failed search is retried on the next call."""
+        calls, state = api
+        state["fail"] = True
+
+        assert (await search_products(SearchProductsInput(query="öl"))).startswith("Error:")
+
+        state["fail"] = False
+        assert "Cached" in await search_products(SearchProductsInput(query="öl"))
+        assert len(calls) == 2
+
+
+class TestTruncation:
+    """Tests for response truncation."""
+
+    def test_short_content_is_unchanged(self):
+        """Test that content within the limit is returned as is."""
+        assert truncate_response("line\n" * 10, limit=100) == "line\n" * 10
+
+    def test_truncates_at_line_break_near_limit(self):
+        """Test that truncation prefers the last line break before the limit."""
+        content = "a" * 85 + "\n" + "b" * 50
+
+        assert truncate_response(content, limit=100) == "a" * 85 + TRUNCATION_NOTICE
+
+    def test_truncates_hard_without_nearby_line_break(self):
+        """Test that truncation falls back to the limit when no line break is close."""
+        content = "a" * 50 + "\n" + "b" * 100
+
+        assert truncate_response(content, limit=100) == content[:100] + TRUNCATION_NOTICE
+
+
+class TestRateLimiter:
+    """Offline tests for the rate-limit throttle."""
+
+    @pytest.fixture
+    def sleeps(self, monkeypatch):
+        """Run the limiter on a fake clock and record every sleep it makes."""
+        clock = {"now": 1_700_000_000.0}
+        delays = []
+        real_sleep = asyncio.sleep
+
+        async def fake_sleep(delay, *args, **kwargs):
+            delays.append(delay)
+            clock["now"] += delay
+            await real_sleep(0)
+
+        fake_time = SimpleNamespace(monotonic=lambda: clock["now"], time=lambda: clock["now"])
+        monkeypatch.setattr(systembolaget_mcp, "time", fake_time)
+        monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+        return delays
+
+    @pytest.fixture
+    def responses(self, monkeypatch):
+        """Serve queued responses to make_api_request through a fresh limiter."""
+        queue = []
+
+        def handler(request):
+            return queue.pop(0)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(systembolaget_mcp, "_get_client", lambda: client)
+        monkeypatch.setattr(systembolaget_mcp, "_rate_limiter", systembolaget_mcp.RateLimiter())
+        return queue
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_response_halves_concurrency_and_pauses(self, sleeps):
+        """Test that a 429 halves concurrency and holds requests for Retry-After."""
+        limiter = systembolaget_mcp.RateLimiter(initial_concurrency=8.0)
+
+        limiter.record(httpx.Response(429, headers={"Retry-After": "5"}), elapsed=0.1)
+        async with limiter.slot():
+            pass
+
+        assert limiter.concurrency == 4.0
+        assert sleeps == [pytest.approx(5.0)]
+
+    def test_fast_responses_raise_concurrency(self):
+        """Test that quick successes grow concurrency up to the maximum."""
+        limiter = systembolaget_mcp.RateLimiter(initial_concurrency=15.0, max_concurrency=16)
+
+        for _ in range(5):
+            limiter.record(httpx.Response(200), elapsed=0.1)
+
+        assert limiter.concurrency == 16.0
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("reset", ["7", "1700000007"])
+    async def test_low_remaining_pauses_until_reset(self, sleeps, reset):
+        """Test that a nearly spent quota waits for X-RateLimit-Reset (duration or timestamp)."""
+        limiter = systembolaget_mcp.RateLimiter()
+        headers = {"X-RateLimit-Remaining": "1", "X-RateLimit-Reset": reset}
+
+        limiter.record(httpx.Response(200, headers=headers), elapsed=0.1)
+        async with limiter.slot():
+            pass
+
+        assert sleeps == [pytest.approx(7.0)]
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_request_is_retried(self, sleeps, responses):
+        """Test that make_api_request retries after a 429 response."""
+        responses.extend(
+            [
+                httpx.Response(429, headers={"Retry-After": "0"}),
+                httpx.Response(200, json={"ok": True}),
+            ]
+        )
+
+        result = await systembolaget_mcp.make_api_request("https://api.example.test/")
+
+        assert result == {"ok": True}
+        assert responses == []
+
+    @pytest.mark.asyncio
+    async def test_backs_off_exponentially_without_retry_after(self, sleeps, responses):
+        """Test that 429 responses without Retry-After back off 1, 2 and 4 seconds."""
+        responses.extend([httpx.Response(429)] * 3 + [httpx.Response(200, json={"ok": True})])
+
+        result = await systembolaget_mcp.make_api_request("https://api.example.test/")
+
+        assert result == {"ok": True}
+        assert sleeps == [pytest.approx(1.0), pytest.approx(2.0), pytest.approx(4.0)]
+
+    @pytest.mark.asyncio
+    async def test_wait_is_capped(self, sleeps, responses):
+        """Test that a long Retry-After is capped at MAX_RATE_LIMIT_WAIT."""
+        responses.extend(
+            [httpx.Response(429, headers={"Retry-After": "600"}), httpx.Response(200, json={})]
+        )
+
+        await systembolaget_mcp.make_api_request("https://api.example.test/")
+
+        assert sleeps == [pytest.approx(systembolaget_mcp.MAX_RATE_LIMIT_WAIT)]
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_retries(self, sleeps, responses):
+        """Test that a 429 on the final attempt raises APIError."""
+        attempts = systembolaget_mcp.RATE_LIMIT_RETRIES + 1
+        responses.extend([httpx.Response(429, headers={"Retry-After": "0"})] * attempts)
+
+        with pytest.raises(systembolaget_mcp.APIError, match="Rate limit exceeded"):
+            await systembolaget_mcp.make_api_request("https://api.example.test/")
+
+        assert responses == []
+
+
+class TestApiKeyExtraction:
+    """Offline tests for API key extraction and caching."""
+
+    @pytest.fixture
+    def website(self, monkeypatch):
+        """Serve a fake website and app bundle, recording requested paths."""
+        requests = []
+        bundles = {"/_next/static/chunks/pages/_app-abc.js": 'NEXT_PUBLIC_API_KEY_APIM:"key-1"'}
+
+        async def handler(request):
+            requests.append(request.url.path)
+            await asyncio.sleep(0)  # Yield like a real network round-trip
+            if request.url.path == "/":
+                html = "".join(f'<script src="{path}"></script>' for path in bundles)
+                return httpx.Response(200, text=html)
+            if request.url.path in bundles:
+                return httpx.Response(200, text=bundles[request.url.path])
+            return httpx.Response(404)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(systembolaget_mcp, "_get_client", lambda: client)
+        monkeypatch.delenv("SYSTEMBOLAGET_API_KEY", raising=False)
+        systembolaget_mcp.invalidate_api_key()
+        yield requests, bundles
+        systembolaget_mcp.invalidate_api_key()
+
+    @staticmethod
+    def expire_api_key(monkeypatch):
+        """Age the cached API key past its TTL, in memory and on disk."""
+        monkeypatch.setattr(systembolaget_mcp, "_api_key_timestamp", 0.0)
+        systembolaget_mcp.persist_api_key("key-1", 0.0)
+
+    @pytest.mark.asyncio
+    async def test_refresh_reuses_cached_bundle_path(self, website, monkeypatch):
+        """Test that an expired key is refreshed from the cached bundle."""
+        requests, _ = website
+
+        assert await systembolaget_mcp.extract_api_key() == "key-1"
+        assert requests == ["/", "/_next/static/chunks/pages/_app-abc.js"]
+
+        self.expire_api_key(monkeypatch)
+        requests.clear()
+
+        assert await systembolaget_mcp.extract_api_key() == "key-1"
+        assert requests == ["/_next/static/chunks/pages/_app-abc.js"]
+
+    @pytest.mark.asyncio
+    async def test_refresh_rescrapes_when_bundle_is_gone(self, website, monkeypatch):
+        """Test that a missing cached bundle falls back to the website."""
+        requests, bundles = website
+
+        assert await systembolaget_mcp.extract_api_key() == "key-1"
+
+        bundles.clear()
+        bundles["/_next/static/chunks/pages/_app-def.js"] = 'NEXT_PUBLIC_API_KEY_APIM:"key-2"'
+        self.expire_api_key(monkeypatch)
+        requests.clear()
+
+        assert await systembolaget_mcp.extract_api_key() == "key-2"
+        assert requests == [
+            "/_next/static/chunks/pages/_app-abc.js",
+            "/",
+            "/_next/static/chunks/pages/_app-def.js",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_refresh(self, website):
+        """Test that simultaneous callers trigger a single extraction."""
+        requests, _ = website
+
+        keys = await asyncio.gather(*(systembolaget_mcp.extract_api_key() for _ in range(5)))
+
+        assert keys == ["key-1"] * 5
+        assert requests == ["/", "/_next/static/chunks/pages/_app-abc.js"]
+
+    @pytest.mark.asyncio
+    async def test_persisted_key_survives_restart(self, website):
+        """Test that a fresh process reuses the key persisted on disk."""
+        requests, _ = website
+
+        assert await systembolaget_mcp.extract_api_key() == "key-1"
+        assert systembolaget_mcp.get_api_key_cache_file().exists()
+
+        # Simulate a restart by clearing the in-memory cache only
+        systembolaget_mcp._cached_api_key = None
+        systembolaget_mcp._api_key_timestamp = None
+        requests.clear()
+
+        assert await systembolaget_mcp.extract_api_key() == "key-1"
+        assert requests == []
+
+        systembolaget_mcp.invalidate_api_key()
+        assert not systembolaget_mcp.get_api_key_cache_file().exists()
+
+    @pytest.mark.asyncio
+    async def test_key_split_across_chunks(self, monkeypatch):
+        """Test that a key spanning several streamed chunks is found."""
+        bundle = b"x" * 5000 + b'NEXT_PUBLIC_API_KEY_APIM:"split-key"' + b"y" * 5000
+
+        async def chunks():
+            for i in range(0, len(bundle), 7):
+                yield bundle[i : i + 7]
+
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, content=chunks()))
+        )
+        monkeypatch.setattr(systembolaget_mcp, "_get_client", lambda: client)
+
+        assert await systembolaget_mcp.fetch_api_key_from_bundle("/_app-abc.js") == "split-key"
+
+
 # Manual test runner for debugging (optional)
 if __name__ == "__main__":
     import sys